@@ -1,12 +1,13 @@
 from fastapi import APIRouter, HTTPException
 from loguru import logger
-from app.ingestion.db_loader import run_db_loader
 
 router = APIRouter(prefix="/db", tags=["DB Loader"])
 
 
 @router.post("/load")
 def load_data_to_db():
+    from app.ingestion.db_loader import run_db_loader
+
     logger.info("API Trigger: Loading data into MySQL...")
     try:
         run_db_loader()
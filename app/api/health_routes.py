@@ -0,0 +1,44 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from loguru import logger
+from sqlalchemy import inspect, text
+
+from app.db.connection import get_engine
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+REQUIRED_TABLES = ["customers", "orders"]
+
+
+@router.get("/live")
+def liveness():
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def readiness():
+    """
+    Ready once the DB is reachable and migrations have created the tables.
+    Returns 503 otherwise so the load balancer keeps traffic away.
+    """
+    try:
+        engine = get_engine()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            existing_tables = inspect(conn).get_table_names()
+    except Exception as e:
+        logger.warning(f"Readiness check failed: {e}")
+        return JSONResponse(status_code=503, content={"status": "unavailable", "detail": str(e)})
+
+    missing_tables = [t for t in REQUIRED_TABLES if t not in existing_tables]
+    if missing_tables:
+        return JSONResponse(
+            status_code=503,
+            content={
+                "status": "unavailable",
+                "detail": f"Database tables not found: {missing_tables}. "
+                          "Run 'python -m app.db.migrations'.",
+            },
+        )
+
+    return {"status": "ready"}
@@ -1,29 +1,27 @@
 from fastapi import APIRouter
-from app.kpi.kpi_memory import (
-    repeat_customers_memory,
-    monthly_order_trends_memory,
-    regional_revenue_memory,
-    top_customers_last_30_days_memory
-)
 
 router = APIRouter(prefix="/kpi/memory", tags=["KPI In-Memory"])
 
 
 @router.get("/repeat-customers")
 def get_repeat_customers():
+    from app.kpi.kpi_memory import repeat_customers_memory
     return repeat_customers_memory()
 
 
 @router.get("/monthly-order-trends")
 def get_monthly_trends():
+    from app.kpi.kpi_memory import monthly_order_trends_memory
     return monthly_order_trends_memory()
 
 
 @router.get("/regional-revenue")
 def get_regional_revenue():
+    from app.kpi.kpi_memory import regional_revenue_memory
     return regional_revenue_memory()
 
 
 @router.get("/top-customers")
 def get_top_customers(limit: int = 10):
+    from app.kpi.kpi_memory import top_customers_last_30_days_memory
     return top_customers_last_30_days_memory(limit=limit)
@@ -7,16 +7,22 @@ router = APIRouter(prefix="/upload", tags=["Upload"])
 UPLOAD_DIR = "data/upload"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+
+def _save_atomically(file: UploadFile, filename: str):
+    # Write-then-rename so a concurrent cleaning run never reads a half-written upload
+    save_path = os.path.join(UPLOAD_DIR, filename)
+    tmp_path = f"{save_path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+    os.replace(tmp_path, save_path)
+
+
 @router.post("/customers")
 async def upload_customers(file: UploadFile = File(...)):
-    save_path = os.path.join(UPLOAD_DIR, "customers.csv")
-    with open(save_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    _save_atomically(file, "customers.csv")
     return {"message": "customers.csv uploaded successfully"}
 
 @router.post("/orders")
 async def upload_orders(file: UploadFile = File(...)):
-    save_path = os.path.join(UPLOAD_DIR, "orders.xml")
-    with open(save_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    _save_atomically(file, "orders.xml")
     return {"message": "orders.xml uploaded successfully"}
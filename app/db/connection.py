@@ -1,43 +1,52 @@
-from dotenv import load_dotenv
-load_dotenv()
+from functools import lru_cache
+import os
 
+from dotenv import load_dotenv
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
-import os
+from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
 
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = os.getenv("DB_PORT")
-DB_NAME = os.getenv("DB_NAME")
-
-# Fail-fast if anything missing
-missing = [k for k, v in {
-    "DB_USER": DB_USER,
-    "DB_PASSWORD": DB_PASSWORD,
-    "DB_HOST": DB_HOST,
-    "DB_PORT": DB_PORT,
-    "DB_NAME": DB_NAME,
-}.items() if not v]
-
-if missing:
-    raise ValueError(f"Missing environment variables: {missing}")
-
-DATABASE_URL = (
-    f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-)
 
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    future=True
-)
+class Base(DeclarativeBase):
+    pass
+
+
+def _database_url() -> str:
+    load_dotenv()
+
+    config = {
+        "DB_USER": os.getenv("DB_USER"),
+        "DB_PASSWORD": os.getenv("DB_PASSWORD"),
+        "DB_HOST": os.getenv("DB_HOST"),
+        "DB_PORT": os.getenv("DB_PORT"),
+        "DB_NAME": os.getenv("DB_NAME"),
+    }
+
+    # Fail-fast if anything missing (on first DB use, not at import time)
+    missing = [k for k, v in config.items() if not v]
+    if missing:
+        raise ValueError(f"Missing environment variables: {missing}")
+
+    return (
+        f"mysql+pymysql://{config['DB_USER']}:{config['DB_PASSWORD']}"
+        f"@{config['DB_HOST']}:{config['DB_PORT']}/{config['DB_NAME']}"
+    )
+
+
+@lru_cache(maxsize=None)
+def get_engine():
+    """Create the engine on first use so importing the app never touches the DB config."""
+    return create_engine(
+        _database_url(),
+        echo=False,
+        future=True
+    )
+
 
 SessionLocal = sessionmaker(
-    bind=engine,
     autoflush=False,
     autocommit=False
 )
 
-class Base(DeclarativeBase):
-    pass
+
+def get_session() -> Session:
+    return SessionLocal(bind=get_engine())
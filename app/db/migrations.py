@@ -0,0 +1,128 @@
+import argparse
+from datetime import date
+
+from loguru import logger
+from sqlalchemy import inspect, text
+
+from app.db.connection import Base, get_engine
+from app.db.models import Customer, Order
+
+
+def _month_starts(start: date, months: int):
+    year, month = start.year, start.month
+    for _ in range(months + 1):
+        yield date(year, month, 1)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def upgrade_orders_key(conn):
+    """
+    Revision 0002: orders used to be keyed on order_id alone, so every SKU
+    of a multi-SKU order overwrote the previous one on upsert. Move the
+    primary key to (order_id, sku_id) and drop the now-redundant
+    uix_order_sku constraint.
+    """
+    inspector = inspect(conn)
+    pk = inspector.get_pk_constraint("orders")["constrained_columns"]
+
+    if pk == ["order_id"]:
+        logger.info("Migrating orders primary key → (order_id, sku_id)")
+        conn.execute(text(
+            "ALTER TABLE orders "
+            "MODIFY sku_id VARCHAR(50) NOT NULL, "
+            "DROP PRIMARY KEY, "
+            "ADD PRIMARY KEY (order_id, sku_id)"
+        ))
+
+    index_names = {ix["name"] for ix in inspector.get_indexes("orders")}
+    if "uix_order_sku" in index_names:
+        logger.info("Dropping redundant index uix_order_sku")
+        conn.execute(text("ALTER TABLE orders DROP INDEX uix_order_sku"))
+
+
+def create_kpi_indexes(conn):
+    """Create the covering indexes declared on Customer and Order if they are missing."""
+    indexes = [*Customer.__table__.indexes, *Order.__table__.indexes]
+    for index in indexes:
+        index.create(bind=conn, checkfirst=True)
+    logger.info(f"Indexes verified: {sorted(ix.name for ix in indexes)}")
+
+
+def partition_orders_by_month(conn, start: date, months: int):
+    """
+    Optional: RANGE-partition orders by month of order_date_time, with one
+    partition per month from `start` plus a catch-all pmax.
+
+    MySQL requires the partitioning column in every unique key and does not
+    support foreign keys on partitioned InnoDB tables. This therefore drops
+    the customer FK and widens the primary key to
+    (order_id, sku_id, order_date_time). Upserts then also match on the
+    timestamp, which is fine as long as an order's time never changes.
+    """
+    partitioned = conn.execute(text(
+        "SELECT COUNT(*) FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'orders' "
+        "AND PARTITION_NAME IS NOT NULL"
+    )).scalar()
+    if partitioned:
+        logger.warning("orders is already partitioned, skipping.")
+        return
+
+    inspector = inspect(conn)
+    for fk in inspector.get_foreign_keys("orders"):
+        logger.info(f"Dropping foreign key {fk['name']} (not allowed on partitioned tables)")
+        conn.execute(text(f"ALTER TABLE orders DROP FOREIGN KEY `{fk['name']}`"))
+
+    conn.execute(text(
+        "ALTER TABLE orders "
+        "MODIFY order_date_time DATETIME NOT NULL, "
+        "DROP PRIMARY KEY, "
+        "ADD PRIMARY KEY (order_id, sku_id, order_date_time)"
+    ))
+
+    bounds = list(_month_starts(start, months))
+    partitions = [
+        f"PARTITION p{lo:%Y%m} VALUES LESS THAN (TO_DAYS('{hi:%Y-%m-%d}'))"
+        for lo, hi in zip(bounds, bounds[1:])
+    ]
+    partitions.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+
+    logger.info(f"Partitioning orders into {len(partitions)} monthly partitions")
+    conn.execute(text(
+        "ALTER TABLE orders PARTITION BY RANGE (TO_DAYS(order_date_time)) ("
+        + ", ".join(partitions)
+        + ")"
+    ))
+
+
+def run_migrations(partition_from: date | None = None, months: int = 24):
+    logger.info("Running schema migrations...")
+
+    with get_engine().begin() as conn:
+        Base.metadata.create_all(bind=conn)
+        upgrade_orders_key(conn)
+        create_kpi_indexes(conn)
+
+        if partition_from is not None:
+            partition_orders_by_month(conn, partition_from, months)
+
+    logger.success("Schema is up to date.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create / upgrade the MySQL schema.")
+    parser.add_argument(
+        "--partition-from",
+        metavar="YYYY-MM",
+        help="Optionally RANGE-partition orders by month, starting at this month.",
+    )
+    parser.add_argument(
+        "--months",
+        type=int,
+        default=24,
+        help="Number of monthly partitions to create (default: 24).",
+    )
+    args = parser.parse_args()
+
+    start = date.fromisoformat(f"{args.partition_from}-01") if args.partition_from else None
+    run_migrations(partition_from=start, months=args.months)
@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, String, Integer, Float, DateTime,
-    ForeignKey, UniqueConstraint
+    ForeignKey, Index
 )
 from sqlalchemy.orm import relationship
 from app.db.connection import Base
@@ -16,14 +16,22 @@ class Customer(Base):
 
     orders = relationship("Order", back_populates="customer")
 
+    __table_args__ = (
+        # Covering index for the customers side of the KPI joins, so a plan
+        # that drives from customers does a full index scan, not type=ALL
+        Index("ix_customers_id_region_name_mobile",
+              "customer_id", "region", "customer_name", "mobile_number"),
+    )
+
 
 class Order(Base):
     __tablename__ = "orders"
 
+    # Orders are stored at SKU level, so (order_id, sku_id) is the key
     order_id = Column(String(50), primary_key=True)
+    sku_id = Column(String(50), primary_key=True)
     mobile_number = Column(String(20), index=True)
     order_date_time = Column(DateTime)
-    sku_id = Column(String(50))
     sku_count = Column(Integer)
     total_amount = Column(Float)
     customer_id = Column(String(50), ForeignKey("customers.customer_id"))
@@ -31,5 +39,9 @@ class Order(Base):
     customer = relationship("Customer", back_populates="orders")
 
     __table_args__ = (
-        UniqueConstraint("order_id", "sku_id", name="uix_order_sku"),
+        # Covers repeat_customers and regional_revenue (join + group by)
+        Index("ix_orders_customer_order_amount", "customer_id", "order_id", "total_amount"),
+        # Covers monthly_order_trends and the top_customers date range
+        Index("ix_orders_date_customer_order_amount",
+              "order_date_time", "customer_id", "order_id", "total_amount"),
     )
@@ -0,0 +1,127 @@
+import argparse
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+
+from loguru import logger
+from sqlalchemy import text
+
+from app.db.connection import get_session
+from app.kpi.kpi_db import (
+    REPEAT_CUSTOMERS_SQL,
+    MONTHLY_ORDER_TRENDS_SQL,
+    REGIONAL_REVENUE_SQL,
+    TOP_CUSTOMERS_SQL,
+)
+
+# Full scans of tables at or above this (estimated) row count fail the audit
+AUDIT_MIN_ROWS = int(os.getenv("KPI_AUDIT_MIN_ROWS", "10000"))
+
+AUDITED_TABLES = ("customers", "orders")
+
+
+def _kpi_queries():
+    cutoff = datetime.now() - timedelta(days=30)
+    return {
+        "repeat_customers": (REPEAT_CUSTOMERS_SQL, {}),
+        "monthly_order_trends": (MONTHLY_ORDER_TRENDS_SQL, {}),
+        "regional_revenue": (REGIONAL_REVENUE_SQL, {}),
+        "top_customers_last_30_days": (TOP_CUSTOMERS_SQL, {"cutoff": cutoff, "limit": 10}),
+    }
+
+
+def _aliases(sql: str) -> dict:
+    """Map `FROM orders o` / `JOIN customers c` aliases back to table names."""
+    return {
+        alias: table
+        for table, alias in re.findall(r"\b(?:FROM|JOIN)\s+(\w+)\s+(\w+)", sql, re.IGNORECASE)
+    }
+
+
+def _table_rows(session) -> dict:
+    """
+    Fresh row estimates per table. MySQL 8 caches TABLE_ROWS for up to 24h
+    (information_schema_stats_expiry), so right after a bulk load it can
+    still read 0. ANALYZE refreshes the statistics (the optimizer's too, so
+    EXPLAIN sees the loaded data), and expiry 0 makes information_schema
+    read them directly.
+    """
+    session.execute(text(f"ANALYZE TABLE {', '.join(AUDITED_TABLES)}")).all()
+    session.execute(text("SET SESSION information_schema_stats_expiry = 0"))
+
+    rows = session.execute(text(
+        "SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE()"
+    )).all()
+    return {name: int(count or 0) for name, count in rows}
+
+
+def audit_kpi_queries(min_rows: int = AUDIT_MIN_ROWS) -> list:
+    """
+    Run EXPLAIN on each KPI query and return the plan rows that do a full
+    table scan (type=ALL) on a table with at least `min_rows` rows.
+    Derived tables (`<derivedN>`) are ignored; their source scans show up
+    as separate plan rows.
+    """
+    violations = []
+
+    with get_session() as session:
+        sizes = _table_rows(session)
+        logger.info(f"Table sizes (estimated): {sizes}")
+
+        for name, (sql, params) in _kpi_queries().items():
+            aliases = _aliases(sql)
+            plan = session.execute(
+                text("EXPLAIN " + sql.strip().rstrip(";")), params
+            ).mappings().all()
+
+            logger.info(f"EXPLAIN {name}:")
+            for row in plan:
+                table = aliases.get(row["table"], row["table"])
+                logger.info(
+                    f"  table={table} type={row['type']} key={row['key']} "
+                    f"rows={row['rows']} extra={row['Extra']}"
+                )
+
+                if row["type"] != "ALL" or not table or table.startswith("<"):
+                    continue
+
+                # Never trust a single estimate to skip the check
+                table_rows = max(sizes.get(table, 0), int(row["rows"] or 0))
+                if table_rows < min_rows:
+                    continue
+
+                violations.append({
+                    "query": name,
+                    "table": table,
+                    "table_rows": table_rows,
+                    "possible_keys": row["possible_keys"],
+                })
+
+    return violations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN the KPI queries and fail on full table scans.")
+    parser.add_argument(
+        "--min-rows",
+        type=int,
+        default=AUDIT_MIN_ROWS,
+        help="Only flag full scans of tables with at least this many rows "
+             "(default: $KPI_AUDIT_MIN_ROWS or 10000).",
+    )
+    args = parser.parse_args()
+
+    violations = audit_kpi_queries(min_rows=args.min_rows)
+
+    if violations:
+        for v in violations:
+            logger.error(
+                f"{v['query']}: full scan of {v['table']} ({v['table_rows']} rows), "
+                f"possible_keys={v['possible_keys']}"
+            )
+        logger.error("Run 'python -m app.db.migrations' to create the KPI indexes.")
+        sys.exit(1)
+
+    logger.success("No full table scans found in KPI queries.")
@@ -3,14 +3,18 @@ import pandas as pd
 from datetime import datetime
 from loguru import logger
 
+from app.ingestion.snapshots import (
+    CUSTOMERS_FILE,
+    ORDERS_FILE,
+    current_snapshot_dir,
+    new_snapshot,
+    writer_lock,
+)
 
 BASE_DATA_DIR = "data"
 UPLOAD_DIR = os.path.join(BASE_DATA_DIR, "upload")
 CLEANED_DIR = os.path.join(BASE_DATA_DIR, "cleaned")
 
-CLEANED_CUSTOMER_PATH = os.path.join(CLEANED_DIR, "customers_cleaned.csv")
-CLEANED_ORDER_PATH = os.path.join(CLEANED_DIR, "orders_cleaned.csv")
-
 RAW_CUSTOMER_PATH = os.path.join(UPLOAD_DIR, "customers.csv")
 RAW_ORDER_PATH    = os.path.join(UPLOAD_DIR, "orders.xml")
 
@@ -70,10 +74,14 @@ def clean_orders(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _append_and_dedupe(new_df: pd.DataFrame, final_path: str, keys: list):
-
-    if os.path.exists(final_path):
-        old_df = pd.read_csv(final_path)
+def _append_and_dedupe(new_df: pd.DataFrame, base_path: str, final_path: str, keys: list):
+    """
+    Append new rows to the file at `base_path` (the current snapshot) and
+    write the result to `final_path` (the snapshot being built). The base
+    file is never modified, so readers of the current snapshot are unaffected.
+    """
+    if os.path.exists(base_path):
+        old_df = pd.read_csv(base_path)
         combined = pd.concat([old_df, new_df], ignore_index=True)
 
         combined.drop_duplicates(subset=keys, keep="last", inplace=True)
@@ -116,21 +124,27 @@ def run_cleaning_pipeline():
         logger.error(f"Cleaning failed: {e}")
         return
 
-    os.makedirs(CLEANED_DIR, exist_ok=True)
-
-    _append_and_dedupe(
-        cleaned_customers,
-        CLEANED_CUSTOMER_PATH,
-        keys=["customer_id"]
-    )
-
     key_cols = ["order_id", "sku_id"] if "sku_id" in cleaned_orders.columns else ["order_id"]
 
-    _append_and_dedupe(
-        cleaned_orders,
-        CLEANED_ORDER_PATH,
-        keys=key_cols
-    )
+    # One writer at a time across all workers; readers keep using the
+    # current snapshot until the new one is published.
+    with writer_lock(CLEANED_DIR):
+        base_dir = current_snapshot_dir(CLEANED_DIR) or CLEANED_DIR
+
+        with new_snapshot(CLEANED_DIR) as snapshot_dir:
+            _append_and_dedupe(
+                cleaned_customers,
+                os.path.join(base_dir, CUSTOMERS_FILE),
+                os.path.join(snapshot_dir, CUSTOMERS_FILE),
+                keys=["customer_id"]
+            )
+
+            _append_and_dedupe(
+                cleaned_orders,
+                os.path.join(base_dir, ORDERS_FILE),
+                os.path.join(snapshot_dir, ORDERS_FILE),
+                keys=key_cols
+            )
 
     logger.success("Cleaning pipeline completed successfully (APPEND MODE).")
 
@@ -3,18 +3,16 @@ import pandas as pd
 from loguru import logger
 from sqlalchemy.dialects.mysql import insert as mysql_insert
 
-from app.db.connection import SessionLocal, engine
+from app.db.connection import get_engine, get_session
 from app.db.models import Customer, Order
+from app.ingestion.snapshots import current_cleaned_files
 from sqlalchemy import inspect
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 CLEANED_DIR = os.path.join(BASE_DIR, "data", "cleaned")
 
 
-def load_cleaned_customers(session, filepath):
-    logger.info(f"Loading customers from: {filepath}")
-    df = pd.read_csv(filepath)
-
+def load_cleaned_customers(session, df):
     for _, row in df.iterrows():
         stmt = mysql_insert(Customer).values(
             customer_id=row["customer_id"],
@@ -34,10 +32,7 @@ def load_cleaned_customers(session, filepath):
     logger.success("Customers loaded successfully (UPSERT).")
 
 
-def load_cleaned_orders(session, filepath):
-    logger.info(f"Loading orders from: {filepath}")
-    df = pd.read_csv(filepath)
-
+def load_cleaned_orders(session, df):
     customers = session.query(Customer).all()
     mobile_to_customer = {str(c.mobile_number): c.customer_id for c in customers}
 
@@ -57,7 +52,6 @@ def load_cleaned_orders(session, filepath):
         stmt = stmt.on_duplicate_key_update(
             mobile_number=stmt.inserted.mobile_number,
             order_date_time=stmt.inserted.order_date_time,
-            sku_id=stmt.inserted.sku_id,
             sku_count=stmt.inserted.sku_count,
             total_amount=stmt.inserted.total_amount,
             customer_id=stmt.inserted.customer_id,
@@ -77,6 +71,8 @@ def run_db_loader():
         logger.error(error_msg)
         raise FileNotFoundError(error_msg)
 
+    engine = get_engine()
+
     # Test database connection
     try:
         with engine.connect() as conn:
@@ -94,7 +90,7 @@ def run_db_loader():
         
         missing_tables = [t for t in required_tables if t not in existing_tables]
         if missing_tables:
-            error_msg = f"Database tables not found: {missing_tables}. Please run 'python scripts/init_db.py' to create tables."
+            error_msg = f"Database tables not found: {missing_tables}. Please run 'python -m app.db.migrations' to create tables."
             logger.error(error_msg)
             raise ValueError(error_msg)
         
@@ -106,28 +102,21 @@ def run_db_loader():
         logger.error(error_msg)
         raise
 
-    session = SessionLocal()
+    session = get_session()
 
     try:
-        cleaned_files = sorted(os.listdir(CLEANED_DIR))
-        logger.info(f"Found {len(cleaned_files)} files in {CLEANED_DIR}")
-
-        customer_files = [f for f in cleaned_files if "customers_cleaned" in f]
-        order_files = [f for f in cleaned_files if "orders_cleaned" in f]
+        # Pin one snapshot so customers and orders come from the same run.
+        # Read both files up front: the upserts are slow, and the snapshot
+        # may be pruned by newer cleaning runs before they finish.
+        latest_customer_file, latest_order_file = current_cleaned_files(CLEANED_DIR)
 
-        if not customer_files or not order_files:
-            error_msg = "No cleaned files found. Run cleaning pipeline first."
-            logger.error(error_msg)
-            raise FileNotFoundError(error_msg)
-
-        latest_customer_file = os.path.join(CLEANED_DIR, customer_files[-1])
-        latest_order_file = os.path.join(CLEANED_DIR, order_files[-1])
-        
         logger.info(f"Loading customers from: {latest_customer_file}")
+        customers_df = pd.read_csv(latest_customer_file)
         logger.info(f"Loading orders from: {latest_order_file}")
+        orders_df = pd.read_csv(latest_order_file)
 
-        load_cleaned_customers(session, latest_customer_file)
-        load_cleaned_orders(session, latest_order_file)
+        load_cleaned_customers(session, customers_df)
+        load_cleaned_orders(session, orders_df)
 
         session.commit()
         logger.success("DB loading completed successfully!")
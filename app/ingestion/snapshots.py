@@ -0,0 +1,146 @@
+import fcntl
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from loguru import logger
+
+
+# Layout of the cleaned data directory:
+#
+#   data/cleaned/
+#     .lock                        cross-process writer lock (flock)
+#     current                      name of the published snapshot
+#     snapshots/<version>/         immutable, one per cleaning run
+#       customers_cleaned.csv
+#       orders_cleaned.csv
+#
+# Writers build a new snapshot in a staging dir under the lock, rename it
+# into place and then swap `current`. Readers resolve `current` once and
+# keep using that snapshot, so they never block and never see partial files.
+CLEANED_DIR = os.path.join("data", "cleaned")
+SNAPSHOTS_SUBDIR = "snapshots"
+CURRENT_POINTER = "current"
+LOCK_FILE = ".lock"
+
+CUSTOMERS_FILE = "customers_cleaned.csv"
+ORDERS_FILE = "orders_cleaned.csv"
+
+# Old snapshots are kept a while for readers that pinned them mid-request
+KEEP_SNAPSHOTS = 5
+
+STAGING_PREFIX = ".staging-"
+
+
+def current_snapshot_dir(cleaned_dir: str = CLEANED_DIR) -> str | None:
+    pointer = os.path.join(cleaned_dir, CURRENT_POINTER)
+    try:
+        with open(pointer) as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(cleaned_dir, SNAPSHOTS_SUBDIR, version)
+
+
+def current_cleaned_files(cleaned_dir: str = CLEANED_DIR):
+    """
+    Pin the current snapshot and return its (customers, orders) paths.
+    Falls back to the flat files written before snapshots existed.
+    """
+    base_dir = current_snapshot_dir(cleaned_dir) or cleaned_dir
+
+    customers = os.path.join(base_dir, CUSTOMERS_FILE)
+    orders = os.path.join(base_dir, ORDERS_FILE)
+
+    if not os.path.exists(customers) or not os.path.exists(orders):
+        raise FileNotFoundError("No cleaned files found. Run cleaning pipeline first.")
+
+    return customers, orders
+
+
+@contextmanager
+def writer_lock(cleaned_dir: str = CLEANED_DIR):
+    """Exclusive cross-process lock for writers; readers never take it."""
+    os.makedirs(cleaned_dir, exist_ok=True)
+
+    with open(os.path.join(cleaned_dir, LOCK_FILE), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _atomic_write_text(path: str, content: str):
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _fsync_path(path: str):
+    """fsync a file, or a directory so its entries (renames) are durable."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_tree(root: str):
+    for entry in os.listdir(root):
+        _fsync_path(os.path.join(root, entry))
+    _fsync_path(root)
+
+
+def _remove_stale_staging(snapshots_dir: str):
+    """Staging dirs left behind by a writer that was killed mid-run."""
+    for entry in os.listdir(snapshots_dir):
+        if entry.startswith(STAGING_PREFIX):
+            logger.warning(f"Removing stale staging dir: {entry}")
+            shutil.rmtree(os.path.join(snapshots_dir, entry), ignore_errors=True)
+
+
+def _prune_snapshots(snapshots_dir: str, current_version: str):
+    versions = sorted(v for v in os.listdir(snapshots_dir) if not v.startswith("."))
+    for version in versions[:-KEEP_SNAPSHOTS]:
+        if version != current_version:
+            shutil.rmtree(os.path.join(snapshots_dir, version), ignore_errors=True)
+
+
+@contextmanager
+def new_snapshot(cleaned_dir: str = CLEANED_DIR):
+    """
+    Yield a staging directory to write the next snapshot into. On success it
+    is renamed to snapshots/<version> and `current` is switched to it; on
+    error it is discarded and `current` is left untouched.
+    Must be used inside writer_lock().
+    """
+    snapshots_dir = os.path.join(cleaned_dir, SNAPSHOTS_SUBDIR)
+    os.makedirs(snapshots_dir, exist_ok=True)
+
+    # The writer lock is held, so any existing staging dir is abandoned
+    _remove_stale_staging(snapshots_dir)
+
+    staging_dir = tempfile.mkdtemp(dir=snapshots_dir, prefix=STAGING_PREFIX)
+    try:
+        yield staging_dir
+        # Make the CSVs durable before anything can point at them
+        _fsync_tree(staging_dir)
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    os.rename(staging_dir, os.path.join(snapshots_dir, version))
+    _fsync_path(snapshots_dir)
+
+    _atomic_write_text(os.path.join(cleaned_dir, CURRENT_POINTER), version)
+    _fsync_path(cleaned_dir)
+    logger.success(f"Published cleaned snapshot: {version}")
+
+    _prune_snapshots(snapshots_dir, version)
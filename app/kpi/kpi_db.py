@@ -6,7 +6,78 @@ from typing import List, Dict, Any
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from app.db.connection import SessionLocal
+from app.db.connection import get_session
+
+
+REPEAT_CUSTOMERS_SQL = """
+SELECT
+  c.customer_id,
+  c.customer_name,
+  c.mobile_number,
+  c.region,
+  u.order_count
+FROM (
+  SELECT
+    o.customer_id,
+    COUNT(DISTINCT o.order_id) AS order_count
+  FROM orders o
+  GROUP BY o.customer_id
+  HAVING COUNT(DISTINCT o.order_id) > 1
+) u
+JOIN customers c ON c.customer_id = u.customer_id
+ORDER BY u.order_count DESC, c.customer_id;
+"""
+
+
+MONTHLY_ORDER_TRENDS_SQL = """
+SELECT
+  DATE_FORMAT(o.order_date_time, '%Y-%m') AS month,
+  COUNT(DISTINCT o.order_id) AS orders_count
+FROM orders o
+GROUP BY DATE_FORMAT(o.order_date_time, '%Y-%m')
+ORDER BY month;
+"""
+
+
+REGIONAL_REVENUE_SQL = """
+SELECT
+  c.region,
+  SUM(u.order_total) AS revenue
+FROM (
+  SELECT
+    o.order_id,
+    o.customer_id,
+    MAX(o.total_amount) AS order_total
+  FROM orders o
+  GROUP BY o.order_id, o.customer_id
+) u
+JOIN customers c ON c.customer_id = u.customer_id
+GROUP BY c.region
+ORDER BY revenue DESC, c.region;
+"""
+
+
+TOP_CUSTOMERS_SQL = """
+SELECT
+  c.customer_id,
+  c.customer_name,
+  c.mobile_number,
+  c.region,
+  SUM(u.order_total) AS total_spend
+FROM (
+  SELECT
+    o.order_id,
+    o.customer_id,
+    MAX(o.total_amount) AS order_total
+  FROM orders o
+  WHERE o.order_date_time >= :cutoff
+  GROUP BY o.order_id, o.customer_id
+) u
+JOIN customers c ON c.customer_id = u.customer_id
+GROUP BY c.customer_id, c.customer_name, c.mobile_number, c.region
+ORDER BY total_spend DESC, c.customer_id
+LIMIT :limit;
+"""
 
 
 def _run(session: Session, sql: str, params: dict | None = None) -> List[Dict[str, Any]]:
@@ -17,22 +88,10 @@ def _run(session: Session, sql: str, params: dict | None = None) -> List[Dict[st
 def repeat_customers() -> List[Dict[str, Any]]:
     """
     Customers with more than one order (counting DISTINCT orders).
+    Aggregates orders first so the join only touches repeat customers.
     """
-    sql = """
-    SELECT
-      c.customer_id,
-      c.customer_name,
-      c.mobile_number,
-      c.region,
-      COUNT(DISTINCT o.order_id) AS order_count
-    FROM orders o
-    JOIN customers c ON c.customer_id = o.customer_id
-    GROUP BY c.customer_id, c.customer_name, c.mobile_number, c.region
-    HAVING COUNT(DISTINCT o.order_id) > 1
-    ORDER BY order_count DESC, c.customer_id;
-    """
-    with SessionLocal() as session:
-        return _run(session, sql)
+    with get_session() as session:
+        return _run(session, REPEAT_CUSTOMERS_SQL)
 
 
 def monthly_order_trends() -> List[Dict[str, Any]]:
@@ -40,16 +99,8 @@ def monthly_order_trends() -> List[Dict[str, Any]]:
     Aggregate orders by calendar month.
     Counts DISTINCT orders (since orders table is SKU-level).
     """
-    sql = """
-    SELECT
-      DATE_FORMAT(o.order_date_time, '%Y-%m') AS month,
-      COUNT(DISTINCT o.order_id) AS orders_count
-    FROM orders o
-    GROUP BY DATE_FORMAT(o.order_date_time, '%Y-%m')
-    ORDER BY month;
-    """
-    with SessionLocal() as session:
-        return _run(session, sql)
+    with get_session() as session:
+        return _run(session, MONTHLY_ORDER_TRENDS_SQL)
 
 
 def regional_revenue() -> List[Dict[str, Any]]:
@@ -59,24 +110,8 @@ def regional_revenue() -> List[Dict[str, Any]]:
     To avoid double counting, we compute one row per order_id,customer_id
     taking MAX(total_amount) and then sum by region.
     """
-    sql = """
-    SELECT
-      c.region,
-      SUM(u.order_total) AS revenue
-    FROM (
-      SELECT
-        o.order_id,
-        o.customer_id,
-        MAX(o.total_amount) AS order_total
-      FROM orders o
-      GROUP BY o.order_id, o.customer_id
-    ) u
-    JOIN customers c ON c.customer_id = u.customer_id
-    GROUP BY c.region
-    ORDER BY revenue DESC, c.region;
-    """
-    with SessionLocal() as session:
-        return _run(session, sql)
+    with get_session() as session:
+        return _run(session, REGIONAL_REVENUE_SQL)
 
 
 def top_customers_last_30_days(limit: int = 10, tz: str = "Asia/Kolkata") -> List[Dict[str, Any]]:
@@ -87,26 +122,5 @@ def top_customers_last_30_days(limit: int = 10, tz: str = "Asia/Kolkata") -> Lis
     now_tz = datetime.now(ZoneInfo(tz))
     cutoff = now_tz - timedelta(days=30)
 
-    sql = """
-    SELECT
-      c.customer_id,
-      c.customer_name,
-      c.mobile_number,
-      c.region,
-      SUM(u.order_total) AS total_spend
-    FROM (
-      SELECT
-        o.order_id,
-        o.customer_id,
-        MAX(o.total_amount) AS order_total
-      FROM orders o
-      WHERE o.order_date_time >= :cutoff
-      GROUP BY o.order_id, o.customer_id
-    ) u
-    JOIN customers c ON c.customer_id = u.customer_id
-    GROUP BY c.customer_id, c.customer_name, c.mobile_number, c.region
-    ORDER BY total_spend DESC, c.customer_id
-    LIMIT :limit;
-    """
-    with SessionLocal() as session:
-        return _run(session, sql, {"cutoff": cutoff, "limit": limit})
+    with get_session() as session:
+        return _run(session, TOP_CUSTOMERS_SQL, {"cutoff": cutoff, "limit": limit})
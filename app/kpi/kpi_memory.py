@@ -1,114 +1,288 @@
+import fcntl
+import hashlib
 import os
+import shutil
+import tempfile
+
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from loguru import logger
 
+from app.ingestion.snapshots import current_cleaned_files
+
 CLEANED_DIR = "data/cleaned"
+CACHE_DIR = "data/cache"
+CACHE_LOCK_FILE = ".lock"
+CACHE_PREFIX = "order_level_"
+CACHE_TMP_PREFIX = ".tmp_order_level_"
 
 
 def _latest_cleaned_files():
-    files = sorted(os.listdir(CLEANED_DIR))
-
-    cust_files = [f for f in files if "customers_cleaned" in f]
-    order_files = [f for f in files if "orders_cleaned" in f]
-
-    if not cust_files or not order_files:
-        raise FileNotFoundError("No cleaned files found.")
-
-    customers = os.path.join(CLEANED_DIR, cust_files[-1])
-    orders = os.path.join(CLEANED_DIR, order_files[-1])
-    return customers, orders
+    # Pins the current snapshot; a concurrent cleaning run publishes a new
+    # one without touching these files.
+    return current_cleaned_files(CLEANED_DIR)
+
+
+# Compact, mmap-able order-level columns. Integer surrogate keys index into
+# the string dictionaries (customer_ids / regions), and timestamps are
+# stored as int64 nanoseconds.
+ORDER_LEVEL_COLUMNS = (
+    "order_key",
+    "customer_key",
+    "order_date_time",
+    "order_total",
+    "region_key",
+    "customer_ids",
+    "regions",
+)
+
+
+def _order_level_cache_dir(cust_path, order_path):
+    """
+    One cache directory per version of the cleaned files, so a new cleaning
+    run never serves stale columns and old versions can simply be deleted.
+    """
+    fingerprint = hashlib.sha1()
+    for path in (cust_path, order_path):
+        st = os.stat(path)
+        fingerprint.update(f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}".encode())
+    return os.path.join(CACHE_DIR, f"{CACHE_PREFIX}{fingerprint.hexdigest()[:16]}")
 
 
-def _load_order_level():
+def _build_order_level(cust_path, order_path):
     """
-    Load customers + orders and convert orders from SKU-level rows
-    to ORDER-LEVEL rows exactly like the DB logic does.
+    Convert SKU-level rows to ORDER-LEVEL columns exactly like the DB logic
+    does, without materialising a merged string frame.
     """
-    cust_path, order_path = _latest_cleaned_files()
-
     logger.info(f"Loading customers → {cust_path}")
-    customers = pd.read_csv(cust_path)
+    customers = pd.read_csv(
+        cust_path,
+        usecols=["customer_id", "mobile_number", "region"],
+        dtype=str,
+    )
 
     logger.info(f"Loading orders → {order_path}")
-    orders = pd.read_csv(order_path)
-
-    # Convert types
-    orders["order_date_time"] = pd.to_datetime(orders["order_date_time"])
-    orders["total_amount"] = pd.to_numeric(orders["total_amount"], errors="coerce").fillna(0)
-
-    # Join with customers
-    merged = orders.merge(
-        customers[["customer_id", "mobile_number", "region"]],
-        on="mobile_number",
-        how="left"
+    orders = pd.read_csv(
+        order_path,
+        usecols=["order_id", "mobile_number", "order_date_time", "total_amount"],
+        dtype={"order_id": str, "mobile_number": str},
     )
 
+    # mobile_number → customer, last row wins (same as the DB loader's dict)
+    customers = customers.drop_duplicates(subset="mobile_number", keep="last")
+    cust_codes, customer_ids = pd.factorize(customers["customer_id"], sort=True)
+    region_codes, regions = pd.factorize(customers["region"], sort=True)
+
+    row = pd.Index(customers["mobile_number"]).get_indexer(orders["mobile_number"])
+    matched = row >= 0
+
+    # Surrogate keys; -1 means "no matching customer". Only index with
+    # matched rows: -1 is out of bounds when there are no customers.
+    customer_key = np.full(len(row), -1)
+    customer_key[matched] = cust_codes[row[matched]]
+    order_key, _ = pd.factorize(orders["order_id"], sort=True)
+
+    sku_level = pd.DataFrame({
+        "order_key": order_key,
+        "customer_key": customer_key,
+        "order_date_time": (
+            pd.to_datetime(orders["order_date_time"])
+            .astype("datetime64[ns]")
+            .to_numpy()
+            .view("int64")
+        ),
+        "order_total": pd.to_numeric(orders["total_amount"], errors="coerce").fillna(0),
+    })
+
     # ✅ Convert SKU-level → ORDER-LEVEL like SQL
     order_level = (
-        merged.groupby(["order_id", "customer_id"], dropna=False)
+        sku_level.groupby(["order_key", "customer_key"])
         .agg(
             order_date_time=("order_date_time", "max"),
-            order_total=("total_amount", "max"),   # EXACT SQL LOGIC
-            region=("region", "first")
+            order_total=("order_total", "max"),   # EXACT SQL LOGIC
         )
         .reset_index()
     )
 
-    return order_level
+    customer_key = order_level["customer_key"].to_numpy()
+    cust_region = np.full(len(customer_ids), -1)
+    cust_region[cust_codes] = region_codes
+    has_customer = customer_key >= 0
+    region_key = np.full(len(customer_key), -1)
+    region_key[has_customer] = cust_region[customer_key[has_customer]]
+
+    return {
+        "order_key": pd.to_numeric(order_level["order_key"], downcast="integer").to_numpy(),
+        "customer_key": pd.to_numeric(order_level["customer_key"], downcast="integer").to_numpy(),
+        "order_date_time": order_level["order_date_time"].to_numpy(dtype="int64"),
+        "order_total": order_level["order_total"].to_numpy(dtype="float64"),
+        "region_key": pd.to_numeric(pd.Series(region_key), downcast="integer").to_numpy(),
+        # Fixed-width unicode keeps the dictionaries mmap-able (no pickling)
+        "customer_ids": np.asarray(customer_ids, dtype=str),
+        "regions": np.asarray(regions, dtype=str),
+    }
+
+
+def _save_order_level(columns, cache_dir):
+    """
+    Write to a temp directory and rename it into place so readers never
+    see a half-written cache. Must be called under the cache lock.
+    """
+    tmp_dir = tempfile.mkdtemp(dir=CACHE_DIR, prefix=CACHE_TMP_PREFIX)
+    try:
+        for name in ORDER_LEVEL_COLUMNS:
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), columns[name])
+        os.rename(tmp_dir, cache_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def _prune_order_level_caches(keep_dir):
+    """
+    Drop caches of older cleaned-file versions and temp dirs left by killed
+    builds. Must be called under the cache lock, so no build is in flight.
+    Workers that still have an old cache mapped keep their pages (unlinked
+    files stay valid until unmapped).
+    """
+    for entry in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, entry)
+        stale_cache = entry.startswith(CACHE_PREFIX) and path != keep_dir
+        if stale_cache or entry.startswith(CACHE_TMP_PREFIX):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _ensure_order_level_cache(cust_path, order_path):
+    """
+    Build the cache for this cleaned-file version exactly once across all
+    workers: the first one builds under an exclusive lock, the others wait
+    and then find the directory already there.
+    """
+    cache_dir = _order_level_cache_dir(cust_path, order_path)
+    if os.path.isdir(cache_dir):
+        return cache_dir
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(os.path.join(CACHE_DIR, CACHE_LOCK_FILE), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if not os.path.isdir(cache_dir):
+                logger.info(f"Building order-level cache → {cache_dir}")
+                _save_order_level(_build_order_level(cust_path, order_path), cache_dir)
+                _prune_order_level_caches(cache_dir)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    return cache_dir
+
+
+def _load_columns(cache_dir):
+    return {
+        name: np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r")
+        for name in ORDER_LEVEL_COLUMNS
+    }
+
+
+def _load_order_level():
+    """
+    Load customers + orders and convert orders from SKU-level rows
+    to ORDER-LEVEL rows exactly like the DB logic does.
+
+    The compact columns are cached as .npy files next to the cleaned data
+    and memory-mapped read-only, so every uvicorn worker shares the same
+    pages instead of holding its own copy.
+    """
+    try:
+        cols = _load_columns(_ensure_order_level_cache(*_latest_cleaned_files()))
+    except FileNotFoundError:
+        # A newer cleaning run was published and its cache build pruned the
+        # one we resolved; resolve `current` again.
+        cols = _load_columns(_ensure_order_level_cache(*_latest_cleaned_files()))
+
+    # Only the integer/float columns go into the frame; the string
+    # dictionaries stay memory-mapped and are decoded for result rows only.
+    order_level = pd.DataFrame(
+        {
+            "order_key": cols["order_key"],
+            "customer_key": cols["customer_key"],
+            "order_date_time": cols["order_date_time"].view("datetime64[ns]"),
+            "order_total": cols["order_total"],
+            "region_key": cols["region_key"],
+        },
+        copy=False,
+    )
+    labels = {
+        "customer_id": cols["customer_ids"],
+        "region": cols["regions"],
+    }
+
+    logger.info(
+        f"Order-level frame: {len(order_level)} rows, "
+        f"{order_level.memory_usage(deep=True).sum() / 1024 ** 2:.2f} MiB"
+    )
+    return order_level, labels
 
 
 def repeat_customers_memory():
-    orders = _load_order_level()
+    orders, labels = _load_order_level()
+    orders = orders[orders["customer_key"] >= 0]
 
     counts = (
-        orders.groupby("customer_id")["order_id"]
+        orders.groupby("customer_key")["order_key"]
         .nunique()
         .reset_index(name="order_count")
     )
 
     repeats = counts[counts["order_count"] > 1]
-    return repeats.to_dict(orient="records")
+    repeats.insert(0, "customer_id", labels["customer_id"][repeats["customer_key"]])
+    return repeats.drop(columns="customer_key").to_dict(orient="records")
 
 
 def monthly_order_trends_memory():
-    orders = _load_order_level()
+    orders, _ = _load_order_level()
 
-    orders["month"] = orders["order_date_time"].dt.to_period("M").astype(str)
+    # Group on datetime64[M] instead of building a string per row
+    orders["month"] = orders["order_date_time"].to_numpy().astype("datetime64[M]")
+    orders = orders[orders["month"].notna()]
 
     trends = (
-        orders.groupby("month")["order_id"]
+        orders.groupby("month")["order_key"]
         .nunique()
         .reset_index(name="orders_count")
     )
+    trends["month"] = trends["month"].dt.strftime("%Y-%m")
 
     return trends.to_dict(orient="records")
 
 
 def regional_revenue_memory():
-    orders = _load_order_level()
+    orders, labels = _load_order_level()
+    orders = orders[orders["region_key"] >= 0]
 
     revenue = (
-        orders.groupby("region")["order_total"]
+        orders.groupby("region_key")["order_total"]
         .sum()
         .reset_index(name="revenue")
     )
 
-    return revenue.to_dict(orient="records")
+    revenue.insert(0, "region", labels["region"][revenue["region_key"]])
+    return revenue.drop(columns="region_key").to_dict(orient="records")
 
 
 def top_customers_last_30_days_memory(limit=10):
-    orders = _load_order_level()
+    orders, labels = _load_order_level()
 
     cutoff = datetime.now() - timedelta(days=30)
-    last30 = orders[orders["order_date_time"] >= cutoff]
+    last30 = orders[(orders["order_date_time"] >= cutoff) & (orders["customer_key"] >= 0)]
 
     ranked = (
-        last30.groupby(["customer_id"])
+        last30.groupby(["customer_key"])
         ["order_total"].sum()
         .reset_index(name="total_spend")
         .sort_values("total_spend", ascending=False)
         .head(limit)
     )
 
-    return ranked.to_dict(orient="records")
+    ranked.insert(0, "customer_id", labels["customer_id"][ranked["customer_key"]])
+    return ranked.drop(columns="customer_key").to_dict(orient="records")
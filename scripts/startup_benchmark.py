@@ -0,0 +1,134 @@
+"""
+Measure cold-start cost of the API:
+
+* import time of `app.main` in a fresh interpreter
+* time-to-first-request: spawn uvicorn and poll /health/live until it answers
+
+Each metric is the median of --runs fresh processes. Exits 1 if a budget is
+exceeded, so CI can track regressions.
+
+    python scripts/startup_benchmark.py --output startup.json \
+        --max-import-seconds 2 --max-first-request-seconds 5 --forbid-pandas
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - t)"
+)
+
+MODULES_SNIPPET = "import sys, app.main; print(' '.join(sys.modules))"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_import() -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=PROJECT_ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def pandas_imported_at_startup() -> bool:
+    out = subprocess.run(
+        [sys.executable, "-c", MODULES_SNIPPET],
+        cwd=PROJECT_ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return "pandas" in out.stdout.split()
+
+
+def measure_first_request(timeout: float = 60.0) -> float:
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health/live"
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited early with code {proc.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as resp:
+                    if resp.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.02)
+        raise TimeoutError(f"No response from {url} within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API import time and time-to-first-request.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    parser.add_argument("--max-import-seconds", type=float)
+    parser.add_argument("--max-first-request-seconds", type=float)
+    parser.add_argument(
+        "--forbid-pandas",
+        action="store_true",
+        help="Fail if importing app.main loads pandas.",
+    )
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    first_requests = [measure_first_request() for _ in range(args.runs)]
+
+    results = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "import_seconds": round(statistics.median(imports), 4),
+        "first_request_seconds": round(statistics.median(first_requests), 4),
+        "pandas_imported_at_startup": pandas_imported_at_startup(),
+    }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failures = []
+    if args.max_import_seconds is not None and results["import_seconds"] > args.max_import_seconds:
+        failures.append(f"import took {results['import_seconds']}s > {args.max_import_seconds}s")
+    if (args.max_first_request_seconds is not None
+            and results["first_request_seconds"] > args.max_first_request_seconds):
+        failures.append(
+            f"first request took {results['first_request_seconds']}s > {args.max_first_request_seconds}s"
+        )
+    if args.forbid_pandas and results["pandas_imported_at_startup"]:
+        failures.append("pandas is imported at startup")
+
+    if failures:
+        print("Startup budget exceeded: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
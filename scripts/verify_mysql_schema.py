@@ -0,0 +1,144 @@
+"""
+End-to-end check of the schema revision against a real MySQL (e.g. the
+compose `mysql` service), using the DB_* variables from .env:
+
+1. recreate `customers` / `orders` with the ORIGINAL schema
+   (orders keyed on order_id only, plus uix_order_sku) and seed rows
+2. run the migrations twice (upgrade, then idempotent no-op)
+3. run them again with monthly partitioning
+4. run the KPI query-plan audit and print every EXPLAIN
+
+DESTRUCTIVE: drops both tables, so it refuses to run without --reset.
+
+    python scripts/verify_mysql_schema.py --reset --seed-customers 20000 \
+        --seed-orders 100000 --partition-from 2025-01
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+from sqlalchemy import inspect, text
+
+from app.db.connection import get_engine
+from app.db.migrations import run_migrations
+from app.db.query_audit import audit_kpi_queries
+
+# DDL the baseline models produced, before revision 0002
+BASELINE_DDL = [
+    """
+    CREATE TABLE customers (
+      customer_id VARCHAR(50) NOT NULL,
+      customer_name VARCHAR(255),
+      mobile_number VARCHAR(20),
+      region VARCHAR(100),
+      PRIMARY KEY (customer_id),
+      INDEX ix_customers_mobile_number (mobile_number)
+    )
+    """,
+    """
+    CREATE TABLE orders (
+      order_id VARCHAR(50) NOT NULL,
+      mobile_number VARCHAR(20),
+      order_date_time DATETIME,
+      sku_id VARCHAR(50),
+      sku_count INTEGER,
+      total_amount FLOAT,
+      customer_id VARCHAR(50),
+      PRIMARY KEY (order_id),
+      CONSTRAINT uix_order_sku UNIQUE (order_id, sku_id),
+      INDEX ix_orders_mobile_number (mobile_number),
+      FOREIGN KEY (customer_id) REFERENCES customers (customer_id)
+    )
+    """,
+]
+
+REGIONS = ["North", "South", "East", "West"]
+
+
+def _describe_orders(conn, label: str):
+    inspector = inspect(conn)
+    pk = inspector.get_pk_constraint("orders")["constrained_columns"]
+    indexes = sorted(ix["name"] for ix in inspector.get_indexes("orders"))
+    partitions = conn.execute(text(
+        "SELECT COUNT(*) FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'orders' "
+        "AND PARTITION_NAME IS NOT NULL"
+    )).scalar()
+    logger.info(f"[{label}] orders PK={pk} indexes={indexes} partitions={partitions}")
+
+
+def _reset_to_baseline(conn, n_customers: int, n_orders: int):
+    conn.execute(text("DROP TABLE IF EXISTS orders"))
+    conn.execute(text("DROP TABLE IF EXISTS customers"))
+    for ddl in BASELINE_DDL:
+        conn.execute(text(ddl))
+
+    rng = random.Random(0)
+    customers = [
+        {"id": f"CUST-{i:07d}", "name": f"Customer {i}",
+         "mobile": str(9100000000 + i), "region": rng.choice(REGIONS)}
+        for i in range(n_customers)
+    ]
+    conn.execute(
+        text("INSERT INTO customers VALUES (:id, :name, :mobile, :region)"),
+        customers,
+    )
+
+    # The baseline key is order_id alone, so seed one SKU per order
+    start = datetime(2025, 1, 1)
+    orders = []
+    for i in range(n_orders):
+        cust = customers[rng.randrange(n_customers)]
+        orders.append({
+            "order_id": f"ORD-{i:08d}", "mobile": cust["mobile"],
+            "ts": start + timedelta(seconds=rng.randrange(3 * 10 ** 7)),
+            "sku": f"SKU-{rng.randrange(100):04d}", "count": rng.randint(1, 5),
+            "amount": rng.randint(100, 9000), "cust": cust["id"],
+        })
+    conn.execute(
+        text("INSERT INTO orders VALUES (:order_id, :mobile, :ts, :sku, :count, :amount, :cust)"),
+        orders,
+    )
+    logger.info(f"Seeded {n_customers} customers, {n_orders} orders (baseline schema)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify migrations + KPI audit against MySQL.")
+    parser.add_argument("--reset", action="store_true", help="Required: drops customers/orders.")
+    parser.add_argument("--seed-customers", type=int, default=20000)
+    parser.add_argument("--seed-orders", type=int, default=100000)
+    parser.add_argument("--partition-from", default="2025-01", metavar="YYYY-MM")
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--min-rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    if not args.reset:
+        parser.error("this drops the customers and orders tables; pass --reset to confirm")
+
+    engine = get_engine()
+    with engine.begin() as conn:
+        _reset_to_baseline(conn, args.seed_customers, args.seed_orders)
+        _describe_orders(conn, "baseline")
+
+    for label in ("migrate #1", "migrate #2 (idempotent)"):
+        run_migrations()
+        with engine.connect() as conn:
+            _describe_orders(conn, label)
+
+    run_migrations(partition_from=date.fromisoformat(f"{args.partition_from}-01"), months=args.months)
+    with engine.connect() as conn:
+        _describe_orders(conn, "partitioned")
+
+    violations = audit_kpi_queries(min_rows=args.min_rows)
+    for v in violations:
+        logger.error(f"{v['query']}: full scan of {v['table']} ({v['table_rows']} rows)")
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()